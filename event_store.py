@@ -0,0 +1,51 @@
+from array import array
+from typing import Dict, Iterable, List
+
+import pysubs2
+
+
+class EventStore:
+    """
+    字幕事件的紧凑列式存储
+    开始/结束时间（毫秒）与行号保存在 array 中，说话人名称驻留为整数 id，
+    避免在大字幕文件上反复遍历 SSAEvent 对象
+    """
+    __slots__ = ("starts", "ends", "line_nums", "speaker_ids", "speakers", "_speaker_index")
+
+    def __init__(self):
+        self.starts = array('q')
+        self.ends = array('q')
+        self.line_nums = array('i')
+        self.speaker_ids = array('i')
+        # id 0 固定为空说话人，与 SSAEvent.name 的默认值一致
+        self.speakers: List[str] = [""]
+        self._speaker_index: Dict[str, int] = {"": 0}
+
+    @classmethod
+    def from_events(cls, events: Iterable[pysubs2.SSAEvent]) -> "EventStore":
+        """从已加载（并已排序）的字幕事件一次性构建"""
+        events = list(events)
+        store = cls()
+        store.starts = array('q', [event.start for event in events])
+        store.ends = array('q', [event.end for event in events])
+        store.line_nums = array('i', range(1, len(events) + 1))
+        intern_speaker = store.intern_speaker
+        store.speaker_ids = array('i', [intern_speaker(event.name or "") for event in events])
+        return store
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def intern_speaker(self, name: str) -> int:
+        """返回说话人名称对应的 id，首次出现时分配新 id"""
+        speaker_id = self._speaker_index.get(name)
+        if speaker_id is None:
+            speaker_id = len(self.speakers)
+            self.speakers.append(name)
+            self._speaker_index[name] = speaker_id
+        return speaker_id
+
+    @property
+    def actors(self) -> List[str]:
+        """所有有效（非空白）的说话人名称"""
+        return [name for name in self.speakers if name.strip()]
@@ -26,12 +26,12 @@ def install_pyinstaller():
 
 
 def get_python_scripts():
-    """获取父目录下所有Python脚本"""
+    """获取父目录下所有Python脚本（共享模块 event_store.py 随引用它的脚本打包）"""
     # 父目录路径
     parent_dir = os.path.abspath(os.path.join(".", ".."))
     scripts = []
     for file in os.listdir(parent_dir):
-        if file.endswith(".py") and file != "package.py":
+        if file.endswith(".py") and file not in ("package.py", "event_store.py"):
             scripts.append(os.path.join(parent_dir, file))
     return sorted(scripts)
 
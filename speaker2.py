@@ -1,23 +1,45 @@
 import argparse
 import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
 from pathlib import Path
 import pysubs2
 from pyannote.audio import Pipeline
 import torch
 from tqdm import tqdm
 
-def find_max_overlap_speaker(sub_start, sub_end, diarization):
+from event_store import EventStore
+
+def build_speaker_tracks(diarization):
+    """将说话人日志展开为按开始时间排序的列式数组，只遍历一次 itertracks"""
+    tracks = sorted(
+        ((segment.start, segment.end, speaker) for segment, _, speaker in diarization.itertracks(yield_label=True)),
+        key=lambda track: track[0]
+    )
+    starts = array('d', (track[0] for track in tracks))
+    ends = array('d', (track[1] for track in tracks))
+    # max_ends[i] 为前 i+1 个片段的最大结束时间，单调不减，可用于二分查找
+    max_ends = array('d', accumulate(ends, max))
+    labels = [track[2] for track in tracks]
+    return starts, ends, max_ends, labels
+
+def find_max_overlap_speaker(sub_start, sub_end, tracks):
+    starts, ends, max_ends, labels = tracks
     max_overlap = 0
     best_speaker = "Unknown" # 默认值
-    
-    for segment, _, speaker in diarization.itertracks(yield_label=True):
-        overlap_start = max(sub_start, segment.start)
-        overlap_end = min(sub_end, segment.end)
+
+    # 只检查可能与字幕重叠的片段：结束时间晚于 sub_start 且开始时间早于 sub_end
+    first = bisect_right(max_ends, sub_start)
+    last = bisect_left(starts, sub_end)
+    for i in range(first, last):
+        overlap_start = max(sub_start, starts[i])
+        overlap_end = min(sub_end, ends[i])
         overlap_duration = overlap_end - overlap_start
         
         if overlap_duration > max_overlap:
             max_overlap = overlap_duration
-            best_speaker = speaker
+            best_speaker = labels[i]
             
     return best_speaker
 
@@ -78,17 +100,20 @@ def main():
     # --- 3. 加载字幕并对齐 ---
     print(f"📝 正在加载字幕文件: {args.subtitle_file} 并进行对齐...")
     subs = pysubs2.load(str(args.subtitle_file), encoding="utf-8")
+    store = EventStore.from_events(subs)
+    tracks = build_speaker_tracks(diarization)
     
     # --- 关键修改：使用 is_output_ass 进行判断 ---
-    for sub_line in tqdm(subs, desc="对齐字幕"):
-        sub_start_sec = sub_line.start / 1000.0
-        sub_end_sec = sub_line.end / 1000.0
+    for i in tqdm(range(len(store)), desc="对齐字幕"):
+        sub_start_sec = store.starts[i] / 1000.0
+        sub_end_sec = store.ends[i] / 1000.0
         
-        speaker_id = find_max_overlap_speaker(sub_start_sec, sub_end_sec, diarization)
+        speaker_id = find_max_overlap_speaker(sub_start_sec, sub_end_sec, tracks)
         
         if speaker_id != "Unknown":
             simple_id = speaker_id.split('_')[1].lstrip('0')
             speaker_name = f"Speaker {simple_id}"
+            sub_line = subs[i]
 
             # 根据输出格式决定如何写入说话人
             if is_output_ass:
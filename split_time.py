@@ -9,6 +9,8 @@ import shutil
 from dataclasses import dataclass, field
 from typing import List, Optional
 
+from event_store import EventStore
+
 # 导入 rich 库的关键组件
 try:
     from rich.console import Console
@@ -23,7 +25,7 @@ FFMPEG_DEFAULT_ARGS = ['-map', '0', '-c', 'copy', '-y']
 DEFAULT_MIN_DURATION = 60.0
 DEFAULT_PADDING = 0.5
 
-@dataclass
+@dataclass(slots=True)
 class Segment:
     """
     用于存储分片信息的数据类
@@ -89,7 +91,7 @@ def format_time(seconds: float) -> str:
     return f"{hours:02d}:{minutes:02d}:{seconds:02d}.{milliseconds:03d}"
 
 def analyze_segments(
-    subs: pysubs2.SSAFile,
+    store: EventStore,
     min_duration: float,
     padding: float,
     console: Console
@@ -97,7 +99,7 @@ def analyze_segments(
     """
     分析字幕并生成分片计划
     """
-    if not subs:
+    if not store:
         return []
 
     # 将输入的秒转换为毫秒，以统一单位
@@ -105,10 +107,10 @@ def analyze_segments(
     padding_ms = padding * 1000
 
     # 分析说话人信息
-    actors = {event.name for event in subs if event.name and event.name.strip()}
+    actors = store.actors
     multi_speaker = len(actors) > 1
     if len(actors) >= 1:
-        console.print(f"说话人列表: [green]{', '.join(sorted(list(actors)))}[/green]")
+        console.print(f"说话人列表: [green]{', '.join(sorted(actors))}[/green]")
     else:
         console.print("[yellow]未检测到有效的说话人信息[/yellow]")
 
@@ -119,10 +121,11 @@ def analyze_segments(
     pad:float=0.0
     line_num:int=0
 
-    for i, event in enumerate(subs):
-        line_num = i + 1
+    speakers = store.speakers
+    for start, end, line_num, speaker_id in zip(store.starts, store.ends, store.line_nums, store.speaker_ids):
+        name = speakers[speaker_id]
 
-        gap = event.start - last_end
+        gap = start - last_end
         if gap<=0:
             pad =0
         elif gap < (2 * padding_ms):
@@ -134,36 +137,36 @@ def analyze_segments(
 
         if seg:
             seg.set_end_time(last_end+pad)
-        last_end = event.end
+        last_end = end
 
         if not seg:
             # 如果当前分片为空，则初始化
-            seg = Segment(event.start-padding_ms,event.end,line_num,line_num)
-            if event.name:
-                seg.last_speaker = event.name
+            seg = Segment(start-padding_ms,end,line_num,line_num)
+            if name:
+                seg.last_speaker = name
             # 无说话人时不再立即添加片段，而是等待达到最小时长再分割
 
         elif seg.duration >= min_duration_ms:
             if multi_speaker:
-                if seg.last_speaker != event.name:
+                if seg.last_speaker != name:
                     # 如果是多说话人且当前说话人与上一个分片的说话人不同，则分割
                     segments.append(seg)
-                    seg = Segment(event.start-pad,event.end,line_num,line_num,event.name)
+                    seg = Segment(start-pad,end,line_num,line_num,name)
                 else:
                     # 如果是多说话人且当前说话人与上一个分片的说话人相同，则继续累积
-                    seg.set_end_time(event.end)
+                    seg.set_end_time(end)
                     seg.end_line_num = line_num
-                    if event.name:
-                        seg.last_speaker = event.name
+                    if name:
+                        seg.last_speaker = name
             else:
                 # 如果是单说话人或无说话人，达到最小时长就分割
                 segments.append(seg)
-                seg = Segment(event.start-pad,event.end,line_num,line_num,event.name if event.name else None)
+                seg = Segment(start-pad,end,line_num,line_num,name if name else None)
         else:
-            seg.set_end_time(event.end)
+            seg.set_end_time(end)
             seg.end_line_num = line_num
-            if event.name:
-                seg.last_speaker = event.name
+            if name:
+                seg.last_speaker = name
 
     if not seg:
         return segments
@@ -175,7 +178,7 @@ def analyze_segments(
         segment.end_line_num = line_num
         segments[-1] = segment
     else:
-        seg.set_end_time(event.end+padding_ms)
+        seg.set_end_time(last_end+padding_ms)
         segments.append(seg)
 
     return segments
@@ -258,7 +261,11 @@ def main():
         console.print("[bold yellow]警告:[/bold yellow] 字幕文件为空或不包含任何有效事件。")
         sys.exit(0)
 
-    segments = analyze_segments(subs, min_duration, padding, console)
+    # 一次性构建列式事件存储，之后不再遍历 SSAEvent 对象
+    store = EventStore.from_events(subs)
+    del subs
+
+    segments = analyze_segments(store, min_duration, padding, console)
 
     if not segments:
         console.print("[yellow]未能根据设定条件生成任何分片。[/yellow]")